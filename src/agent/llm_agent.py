@@ -1,12 +1,22 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import ollama
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 import logging
 import json
+import time
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "You are a data analysis assistant specialized in analyzing numerical data."
+
+ANSWER_INSTRUCTIONS = """For every question, please provide:
+1. A direct answer with specific numbers
+2. Any relevant statistics from the data
+3. Important patterns or trends (if any)
+4. Data limitations (if applicable)"""
+
 class RateLimitError(Exception):
     """Raised when query rate limit is exceeded"""
     pass
@@ -14,12 +24,36 @@ class RateLimitError(Exception):
 class QueryRequest(BaseModel):
     question: str
     context: Dict[str, Any]
+    session_id: Optional[str] = None
+
+class ConversationSession(BaseModel):
+    """Chat history for one user, tied to the dataset context it was asked about."""
+    context: str
+    history: List[Dict[str, str]] = Field(default_factory=list)
+    last_ttft: Optional[float] = None
 
 class LLMAgent:
-    def __init__(self, model_name: str = "llama3:8b", rate_limit_seconds: int = 1):
+    def __init__(
+        self,
+        model_name: str = "llama3:8b",
+        rate_limit_seconds: int = 1,
+        host: Optional[str] = None,
+        history_token_budget: int = 2048,
+        keep_alive: str = "30m",
+        num_ctx: int = 8192,
+        max_sessions: int = 256
+    ):
         self.model = model_name
+        self.client = ollama.Client(host=host)
         self.rate_limit = rate_limit_seconds
         self.last_query_time: Optional[datetime] = None
+        self.history_token_budget = history_token_budget
+        # Keeping the model loaded with a fixed context size lets Ollama reuse
+        # the KV cache of the shared prompt prefix between turns
+        self.keep_alive = keep_alive
+        self.num_ctx = num_ctx
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
 
     async def process_query(self, query: QueryRequest) -> str:
         """Process a query with rate limiting."""
@@ -32,32 +66,85 @@ class LLMAgent:
 
             self.last_query_time = datetime.now()
             context = self._format_context(query.context)
-            
+
             if "No data available" in context:
                 return context
 
-            response = ollama.chat(
+            session = self._get_session(query.session_id, context)
+            prompt = {"role": "user", "content": self._create_prompt(query.question)}
+            messages = [
+                {"role": "system", "content": self._create_system_prompt(session.context)},
+                *session.history,
+                prompt
+            ]
+
+            start = time.perf_counter()
+            chunks = []
+            for chunk in self.client.chat(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are a data analysis assistant specialized in analyzing numerical data."
-                    },
-                    {
-                        "role": "user", 
-                        "content": self._create_prompt(query.question, context)
-                    }
-                ]
-            )
-            
-            return response['message']['content']
-            
+                messages=messages,
+                stream=True,
+                keep_alive=self.keep_alive,
+                options={"num_ctx": self.num_ctx}
+            ):
+                if not chunks:
+                    session.last_ttft = time.perf_counter() - start
+                chunks.append(chunk['message']['content'])
+            if not chunks:
+                logger.error("Query processing failed: empty response from model")
+                return "Error: The model returned an empty response"
+            answer = "".join(chunks)
+            logger.debug("Time to first token: %s s (%d prior turns)", session.last_ttft, len(session.history) // 2)
+
+            session.history.append(prompt)
+            session.history.append({"role": "assistant", "content": answer})
+            self._trim_history(session)
+
+            return answer
+
         except RateLimitError:
             raise
         except Exception as e:
             logger.error(f"Query processing failed: {str(e)}")
             return f"Error: {str(e)}"
 
+    def reset_session(self, session_id: str) -> None:
+        """Forget the conversation history for a session."""
+        self.sessions.pop(session_id, None)
+
+    def _get_session(self, session_id: Optional[str], context: str) -> ConversationSession:
+        """Return the session for this id, starting over if the dataset changed."""
+        if session_id is None:
+            return ConversationSession(context=context)
+
+        session = self.sessions.get(session_id)
+        if session is None or session.context != context:
+            session = ConversationSession(context=context)
+            self.sessions[session_id] = session
+        self.sessions.move_to_end(session_id)
+
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        return session
+
+    def _trim_history(self, session: ConversationSession) -> None:
+        """
+        Drop the oldest turns once history exceeds the token budget.
+
+        History is cut back to half the budget rather than just under it, so the
+        cached prompt prefix is invalidated once per several turns instead of
+        on every turn.
+        """
+        if self._estimate_tokens(session.history) <= self.history_token_budget:
+            return
+        while session.history and self._estimate_tokens(session.history) > self.history_token_budget // 2:
+            del session.history[:2]
+
+    @staticmethod
+    def _estimate_tokens(messages: List[Dict[str, str]]) -> int:
+        """Rough token count (~4 characters per token)."""
+        return sum(len(message["content"]) for message in messages) // 4
+
     def _is_rate_limited(self) -> bool:
         """Check if the request should be rate limited."""
         if self.last_query_time is None:
@@ -82,17 +169,17 @@ class LLMAgent:
                 sections.append(f"  {col}:\n{stats_str}")
         return "\n".join(sections)
 
-    def _create_prompt(self, question: str, context: str) -> str:
-        """Create a structured prompt for the model."""
-        return f"""Please analyze this data:
+    def _create_system_prompt(self, context: str) -> str:
+        """Create the system prompt; identical for every turn on the same dataset."""
+        return f"""{SYSTEM_PROMPT}
+
+Please analyze this data:
 
 {context}
 
-Question: {question}
+{ANSWER_INSTRUCTIONS}
+"""
 
-Please provide:
-1. A direct answer with specific numbers
-2. Any relevant statistics from the data
-3. Important patterns or trends (if any)
-4. Data limitations (if applicable)
-"""
\ No newline at end of file
+    def _create_prompt(self, question: str) -> str:
+        """Create the user turn for a question."""
+        return f"Question: {question}"
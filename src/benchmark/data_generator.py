@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Sequence, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DTYPES = ('float', 'int', 'category', 'datetime', 'bool')
+
+def generate_dataframe(
+    rows: int = 1000,
+    columns: int = 5,
+    dtypes: Sequence[str] = ('float', 'int', 'category'),
+    seed: Optional[int] = 0
+) -> pd.DataFrame:
+    """
+    Build a synthetic DataFrame for benchmarking.
+
+    Args:
+        rows: Number of rows to generate
+        columns: Number of columns to generate
+        dtypes: Column types, cycled until `columns` columns exist
+        seed: Random seed so runs are reproducible
+
+    Returns:
+        pd.DataFrame: Columns are named `<dtype>_<index>`
+    """
+    if rows < 1 or columns < 1:
+        raise ValueError("rows and columns must be at least 1")
+    if not dtypes:
+        raise ValueError("At least one dtype is required")
+
+    unknown = [dtype for dtype in dtypes if dtype not in SUPPORTED_DTYPES]
+    if unknown:
+        raise ValueError(f"Unsupported dtypes {unknown}. Must be one of: {list(SUPPORTED_DTYPES)}")
+
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        dtype = dtypes[i % len(dtypes)]
+        name = f"{dtype}_{i}"
+        if dtype == 'float':
+            data[name] = rng.normal(loc=100.0, scale=25.0, size=rows).round(4)
+        elif dtype == 'int':
+            data[name] = rng.integers(0, 10_000, size=rows)
+        elif dtype == 'category':
+            data[name] = rng.choice([f"cat_{c}" for c in range(10)], size=rows)
+        elif dtype == 'datetime':
+            offsets = rng.integers(0, 365 * 24 * 60, size=rows)
+            data[name] = pd.Timestamp("2024-01-01") + pd.to_timedelta(offsets, unit="min")
+        elif dtype == 'bool':
+            data[name] = rng.random(size=rows) < 0.5
+
+    return pd.DataFrame(data)
+
+def generate_csv(
+    path: Union[str, Path],
+    rows: int = 1000,
+    columns: int = 5,
+    dtypes: Sequence[str] = ('float', 'int', 'category'),
+    seed: Optional[int] = 0
+) -> Path:
+    """Write a synthetic CSV file and return its path."""
+    path = Path(path)
+    df = generate_dataframe(rows=rows, columns=columns, dtypes=dtypes, seed=seed)
+    df.to_csv(path, index=False)
+    logger.info(f"Generated {path} with {rows} rows and {columns} columns")
+    return path
@@ -0,0 +1,169 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import threading
+import os
+import logging
+import json
+import time
+
+logger = logging.getLogger(__name__)
+
+class FakeOllamaServer:
+    """
+    Local stand-in for the Ollama HTTP API used by benchmarks.
+
+    Answers `/api/chat` (streaming and non-streaming) with canned text after
+    waiting `latency` seconds plus prompt prefill time for the first token, and
+    then emitting `response_tokens` tokens at `tokens_per_second`.
+
+    Prefill is simulated like Ollama's KV cache: only the part of the prompt
+    not shared with one of the last `cache_slots` prompts is charged, at
+    `prefill_tokens_per_second` (about 4 characters per token).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        tokens_per_second: float = 200.0,
+        response_tokens: int = 50,
+        prefill_tokens_per_second: float = 2000.0,
+        cache_slots: int = 4
+    ):
+        if tokens_per_second <= 0 or prefill_tokens_per_second <= 0:
+            raise ValueError("tokens_per_second and prefill_tokens_per_second must be positive")
+
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self.request_count = 0
+        self.last_request: Optional[Dict[str, Any]] = None
+        self.cached_prompt_chars = 0
+        self._cache: deque = deque(maxlen=cache_slots)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Fake Ollama server listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _record_request(self, request: Dict[str, Any]) -> None:
+        with self._lock:
+            self.request_count += 1
+            self.last_request = request
+
+    def _prefill_seconds(self, messages: List[Dict[str, Any]]) -> float:
+        """Charge prefill for the prompt suffix not covered by a cached prefix."""
+        prompt = "".join(f"<{m.get('role')}>{m.get('content', '')}" for m in messages)
+        with self._lock:
+            best = max((len(os.path.commonprefix([cached, prompt])) for cached in self._cache), default=0)
+            self._cache.append(prompt)
+            self.cached_prompt_chars += best
+        return (len(prompt) - best) / 4 / self.prefill_tokens_per_second
+
+    def _chunk(self, model: str, content: str, done: bool, **extra: Any) -> Dict[str, Any]:
+        chunk = {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": done
+        }
+        chunk.update(extra)
+        return chunk
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def _send_json(self, payload: Dict[str, Any], status: int = 200) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/api/version":
+                    self._send_json({"version": "fake"})
+                elif self.path == "/api/tags":
+                    self._send_json({"models": []})
+                else:
+                    self._send_json({"error": "not found"}, status=404)
+
+            def do_POST(self):
+                if self.path != "/api/chat":
+                    self._send_json({"error": "not found"}, status=404)
+                    return
+
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                server._record_request(request)
+
+                model = request.get("model", "fake")
+                stream = request.get("stream", True)
+                token_delay = 1.0 / server.tokens_per_second
+                tokens = ["token "] * server.response_tokens
+                start = time.perf_counter()
+
+                time.sleep(server.latency + server._prefill_seconds(request.get("messages", [])))
+                if not stream:
+                    time.sleep(token_delay * len(tokens))
+                    self._send_json(server._chunk(
+                        model,
+                        "".join(tokens),
+                        True,
+                        done_reason="stop",
+                        total_duration=int((time.perf_counter() - start) * 1e9),
+                        eval_count=len(tokens)
+                    ))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                for token in tokens:
+                    self.wfile.write((json.dumps(server._chunk(model, token, False)) + "\n").encode())
+                    self.wfile.flush()
+                    time.sleep(token_delay)
+                final = server._chunk(
+                    model,
+                    "",
+                    True,
+                    done_reason="stop",
+                    total_duration=int((time.perf_counter() - start) * 1e9),
+                    eval_count=len(tokens)
+                )
+                self.wfile.write((json.dumps(final) + "\n").encode())
+                self.close_connection = True
+
+        return Handler
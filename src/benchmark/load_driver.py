@@ -0,0 +1,202 @@
+"""
+Offline load driver for CSVQAApp.
+
+Run from the `src` directory so the app modules resolve the same way they do
+for `python main.py`:
+
+    python -m benchmark.load_driver --sessions 8 --rows 50000 --output run.json
+    python -m benchmark.load_driver --baseline run.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import plotly.graph_objects as go
+
+from agent.llm_agent import LLMAgent
+from benchmark.data_generator import generate_csv
+from benchmark.fake_ollama import FakeOllamaServer
+from benchmark.stats import StageRecorder, format_report
+from main import CSVQAApp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUESTIONS = [
+    "What is the average of each numeric column?",
+    "Which column has the largest spread?",
+    "Are there any missing values?"
+]
+
+async def _run_session(
+    app: CSVQAApp,
+    session_id: str,
+    csv_path: Path,
+    questions: List[str],
+    plot_types: List[str],
+    recorder: StageRecorder
+) -> None:
+    """
+    Drive one simulated user session: upload, ask questions, plot.
+
+    Like Gradio, synchronous handlers run in a worker thread and
+    `handle_question` runs on the event loop shared by every session.
+    """
+    request = SimpleNamespace(session_hash=session_id)
+
+    start = time.perf_counter()
+    _, status, _, _, _ = await asyncio.to_thread(
+        app.handle_file_upload, SimpleNamespace(name=str(csv_path)), request=request
+    )
+    recorder.record('upload', time.perf_counter() - start, ok=status == "File loaded successfully")
+
+    for turn, question in enumerate(questions):
+        start = time.perf_counter()
+        answer = await app.handle_question(question, request=request)
+        ok = not answer.startswith("Error")
+        recorder.record('question' if turn == 0 else 'followup', time.perf_counter() - start, ok=ok)
+        session = app.llm_agent.sessions.get(session_id)
+        if ok and session is not None and session.last_ttft is not None:
+            recorder.record('ttft_first' if turn == 0 else 'ttft_followup', session.last_ttft)
+
+    df = app.csv_handler.get_dataframe()
+    if df is None:
+        return
+    numeric = list(df.select_dtypes(include='number').columns)
+    x_col = numeric[0] if numeric else df.columns[0]
+    y_col = numeric[1] if len(numeric) > 1 else x_col
+
+    for plot_type in plot_types:
+        start = time.perf_counter()
+        fig = await asyncio.to_thread(app.create_plot, x_col, y_col, plot_type, request=request)
+        ok = isinstance(fig, go.Figure)
+        recorder.record('plot', time.perf_counter() - start, ok=ok)
+        if ok:
+            start = time.perf_counter()
+            payload = fig.to_json()
+            recorder.record('plot_serialize', time.perf_counter() - start)
+            recorder.record_bytes('plot_serialize', len(payload.encode()))
+
+async def _run_sessions(app: CSVQAApp, sessions: int, *args) -> None:
+    await asyncio.gather(*(_run_session(app, f"session-{i}", *args) for i in range(sessions)))
+
+def run_benchmark(
+    sessions: int = 4,
+    rows: int = 10_000,
+    columns: int = 6,
+    dtypes: tuple = ('float', 'int', 'category'),
+    questions: Optional[List[str]] = None,
+    plot_types: Optional[List[str]] = None,
+    latency: float = 0.05,
+    tokens_per_second: float = 200.0,
+    response_tokens: int = 50,
+    prefill_tokens_per_second: float = 2000.0,
+    rate_limit_seconds: Optional[float] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Run `sessions` concurrent sessions against CSVQAApp and a fake Ollama server.
+
+    All sessions share one CSVQAApp and LLMAgent on one event loop, as in a
+    single-process server, so the agent's blocking model call and its rate
+    limiter affect every session. `rate_limit_seconds` defaults to the
+    agent's own default.
+
+    Returns:
+        Dict[str, Any]: Run configuration and per-stage statistics
+    """
+    questions = questions if questions is not None else DEFAULT_QUESTIONS
+    plot_types = plot_types if plot_types is not None else ['scatter', 'line', 'bar', 'histogram']
+    recorder = StageRecorder()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeOllamaServer(
+        latency=latency,
+        tokens_per_second=tokens_per_second,
+        response_tokens=response_tokens,
+        prefill_tokens_per_second=prefill_tokens_per_second,
+        cache_slots=sessions
+    ) as server:
+        csv_path = generate_csv(
+            Path(tmp_dir) / "benchmark.csv",
+            rows=rows,
+            columns=columns,
+            dtypes=dtypes,
+            seed=seed
+        )
+        agent_kwargs = {} if rate_limit_seconds is None else {'rate_limit_seconds': rate_limit_seconds}
+        app = CSVQAApp(llm_agent=LLMAgent(host=server.url, **agent_kwargs))
+        start = time.perf_counter()
+        asyncio.run(_run_sessions(app, sessions, csv_path, questions, plot_types, recorder))
+        wall_time = time.perf_counter() - start
+
+    return {
+        'config': {
+            'sessions': sessions,
+            'rows': rows,
+            'columns': columns,
+            'dtypes': list(dtypes),
+            'questions': len(questions),
+            'plot_types': plot_types,
+            'latency': latency,
+            'tokens_per_second': tokens_per_second,
+            'response_tokens': response_tokens,
+            'prefill_tokens_per_second': prefill_tokens_per_second,
+            'rate_limit_seconds': app.llm_agent.rate_limit
+        },
+        'wall_time_s': wall_time,
+        'stages': recorder.summary(wall_time)
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load test for the CSV QA app")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--dtypes", default="float,int,category")
+    parser.add_argument("--plot-types", default="scatter,line,bar,histogram")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--response-tokens", type=int, default=50)
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=2000.0)
+    parser.add_argument(
+        "--rate-limit-seconds",
+        type=float,
+        help="Agent rate limit shared by all sessions (default: the app's)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a previous JSON results file")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level)
+
+    results = run_benchmark(
+        sessions=args.sessions,
+        rows=args.rows,
+        columns=args.columns,
+        dtypes=tuple(args.dtypes.split(",")),
+        plot_types=args.plot_types.split(","),
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+        rate_limit_seconds=args.rate_limit_seconds,
+        seed=args.seed
+    )
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+    print(format_report(results, baseline))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
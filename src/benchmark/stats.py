@@ -0,0 +1,77 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+STAGES = ('upload', 'question', 'followup', 'ttft_first', 'ttft_followup', 'plot', 'plot_serialize')
+
+class StageRecorder:
+    """Thread-safe collector of per-stage latencies and payload sizes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.payload_bytes: Dict[str, List[int]] = defaultdict(list)
+
+    def record(self, stage: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            self.latencies[stage].append(seconds)
+            if not ok:
+                self.errors[stage] += 1
+
+    def record_bytes(self, stage: str, size: int) -> None:
+        with self._lock:
+            self.payload_bytes[stage].append(size)
+
+    def summary(self, wall_time: float) -> Dict[str, Dict[str, float]]:
+        """Return p50/p95/p99 latency (ms) and throughput (ops/s) per stage."""
+        results = {}
+        for stage in STAGES:
+            samples = self.latencies.get(stage)
+            if not samples:
+                continue
+            p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+            results[stage] = {
+                'count': len(samples),
+                'errors': self.errors.get(stage, 0),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'throughput_per_s': len(samples) / wall_time if wall_time > 0 else 0.0
+            }
+            sizes = self.payload_bytes.get(stage)
+            if sizes:
+                results[stage]['p50_bytes'] = float(np.percentile(sizes, 50))
+                results[stage]['max_bytes'] = float(max(sizes))
+        return results
+
+def format_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Render stage statistics as a table, with p50/p95 deltas against a baseline."""
+    header = f"{'stage':<16}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}"
+    if baseline:
+        header += f"{'Δp50':>9}{'Δp95':>9}"
+    lines = [header, "-" * len(header)]
+
+    for stage, stats in results['stages'].items():
+        line = (
+            f"{stage:<16}{stats['count']:>7}{stats['errors']:>8}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+            f"{stats['throughput_per_s']:>10.2f}"
+        )
+        base = (baseline or {}).get('stages', {}).get(stage)
+        if base:
+            for key in ('p50_ms', 'p95_ms'):
+                delta = (stats[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+                line += f"{delta:>+8.1f}%"
+        lines.append(line)
+
+    for stage, stats in results['stages'].items():
+        if 'p50_bytes' in stats:
+            lines.append(
+                f"{stage} payload: p50 {stats['p50_bytes'] / 1024:.1f} KiB, "
+                f"max {stats['max_bytes'] / 1024:.1f} KiB"
+            )
+    lines.append(f"wall time: {results['wall_time_s']:.2f}s")
+    return "\n".join(lines)
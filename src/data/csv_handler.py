@@ -1,16 +1,23 @@
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
+import hashlib
 import logging
 
+if TYPE_CHECKING:
+    # Only multi-worker mode needs the store (and pyarrow)
+    from .shared_store import SharedDatasetStore
+
 logger = logging.getLogger(__name__)
 
 class CSVHandler:
-    def __init__(self):
+    def __init__(self, dataset_store: Optional["SharedDatasetStore"] = None):
         self.df: Optional[pd.DataFrame] = None
         self.max_file_size = 25 * 1024 * 1024  # 25MB
+        self.dataset_store = dataset_store
+        self.dataset_id: Optional[str] = None
 
-    def load_csv(self, file_path: str) -> bool:
+    def load_csv(self, file_path: str, session_id: Optional[str] = None) -> bool:
         try:
             path = Path(file_path)
             if not path.exists():
@@ -21,11 +28,38 @@ class CSVHandler:
             
             self.df = pd.read_csv(file_path)
             logger.info(f"Successfully loaded CSV with {len(self.df)} rows")
+
+            if self.dataset_store is not None:
+                if session_id is None:
+                    raise ValueError("A session id is required to publish to the shared store")
+                content_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+                self.dataset_id = self.dataset_store.publish(
+                    self.df,
+                    session_id=session_id,
+                    dataset_id=content_hash
+                )
             return True
             
         except Exception as e:
             logger.error(f"Error loading CSV: {str(e)}")
             self.df = None
+            self.dataset_id = None
+            return False
+
+    def load_shared(self, dataset_id: str, session_id: str) -> bool:
+        """Attach to a dataset the session published to the shared store."""
+        try:
+            if self.dataset_store is None:
+                raise ValueError("No shared dataset store configured")
+
+            self.df = self.dataset_store.open(dataset_id, session_id)
+            self.dataset_id = dataset_id
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading shared dataset: {str(e)}")
+            self.df = None
+            self.dataset_id = None
             return False
 
     def get_dataframe(self) -> Optional[pd.DataFrame]:
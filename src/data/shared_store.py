@@ -0,0 +1,254 @@
+import pandas as pd
+import pyarrow as pa
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+import atexit
+import fcntl
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DATASET_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# infer_dtype results that Arrow converts natively from an object column
+ARROW_OBJECT_TYPES = {"string", "bytes", "boolean", "integer", "floating", "empty", "date", "datetime", "decimal"}
+
+class SharedDatasetStore:
+    """
+    Share loaded datasets between worker processes on one host.
+
+    Each dataset is published once as an Arrow IPC file under `root`
+    (tmpfs such as /dev/shm by default) and memory-mapped by every worker that
+    needs it, so numeric columns are read without copying. A `<id>.refs` file
+    tracks who holds the dataset: the sessions that uploaded it (with the time
+    each last used it) and each worker process that has it mapped
+    (`pid:<pid>`). The files are removed once no holder remains.
+
+    A session can only read or release datasets it uploaded. The app uses
+    Gradio's `session_hash` as the session id: a random value the browser
+    generates and sends with each request. It works as a bearer token, so
+    anyone who learns a session's hash can act as that session.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path] = "/dev/shm/csv-qa",
+        max_open: int = 16,
+        session_ttl_seconds: float = 3600
+    ):
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_open = max_open
+        self.session_ttl = session_ttl_seconds
+        self._holder = f"pid:{os.getpid()}"
+        self._open: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._open_lock = threading.Lock()
+        atexit.register(self.close_all)
+
+    def publish(self, df: pd.DataFrame, session_id: str, dataset_id: Optional[str] = None) -> str:
+        """
+        Write a DataFrame to shared memory and record `session_id` as a holder.
+
+        Args:
+            df: DataFrame to share
+            session_id: Id of the uploading session (Gradio `session_hash`)
+            dataset_id: 64-character hex id (e.g. a SHA-256 content hash) so
+                identical uploads are published once; random if omitted
+
+        Returns:
+            str: Id the session can pass to `open`
+        """
+        dataset_id = dataset_id or secrets.token_hex(32)
+        data_path = self._data_path(dataset_id)
+        with self._locked():
+            if not data_path.exists():
+                table = pa.Table.from_pandas(self._arrow_compatible(df), preserve_index=False)
+                tmp_path = self.root / f".{dataset_id}.{os.getpid()}.tmp"
+                with pa.OSFile(str(tmp_path), "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(tmp_path, data_path)
+                logger.info(f"Published dataset {dataset_id} ({len(df)} rows) to {self.root}")
+            refs = self._read_refs(dataset_id)
+            # One entry per session, so re-uploading the same file adds no refs
+            refs["sessions"][session_id] = time.time()
+            self._write_or_delete(dataset_id, refs)
+        return dataset_id
+
+    def open(self, dataset_id: str, session_id: str) -> pd.DataFrame:
+        """
+        Memory-map a dataset held by `session_id`, reusing this process's mapping.
+
+        Raises:
+            KeyError: If the dataset does not exist or the session does not hold it
+        """
+        data_path = self._data_path(dataset_id)
+        with self._open_lock:
+            with self._locked():
+                refs = self._read_refs(dataset_id)
+                if session_id not in refs["sessions"] or not data_path.exists():
+                    raise KeyError(f"Dataset not found: {dataset_id}")
+                refs["sessions"][session_id] = time.time()
+
+                table = None
+                if dataset_id not in self._open:
+                    table = pa.ipc.open_file(pa.memory_map(str(data_path), "r")).read_all()
+                    refs["workers"][self._holder] = refs["workers"].get(self._holder, 0) + 1
+                self._write_or_delete(dataset_id, refs)
+
+            if table is not None:
+                # split_blocks keeps numeric columns as views over the mapped buffers
+                self._open[dataset_id] = table.to_pandas(split_blocks=True)
+                while len(self._open) > self.max_open:
+                    evicted, _ = self._open.popitem(last=False)
+                    self._release_worker(evicted)
+            self._open.move_to_end(dataset_id)
+            return self._open[dataset_id]
+
+    def release_session(self, session_id: str, keep: Optional[str] = None) -> None:
+        """Drop `session_id` from every dataset except `keep`, e.g. after it loads another file."""
+        with self._locked():
+            for dataset_id in self._dataset_ids():
+                if dataset_id == keep:
+                    continue
+                refs = self._read_refs(dataset_id)
+                if refs["sessions"].pop(session_id, None) is not None:
+                    self._write_or_delete(dataset_id, refs)
+
+    def close(self, dataset_id: str) -> None:
+        """Unmap a dataset in this process and drop the process reference."""
+        with self._open_lock:
+            if self._open.pop(dataset_id, None) is not None:
+                self._release_worker(dataset_id)
+
+    def close_all(self) -> None:
+        for dataset_id in list(self._open):
+            self.close(dataset_id)
+
+    def sweep(self) -> int:
+        """
+        Remove references held by dead processes and sessions idle past the TTL,
+        then delete datasets nobody holds.
+
+        Returns:
+            int: Number of datasets deleted
+        """
+        removed = 0
+        now = time.time()
+        with self._locked():
+            for dataset_id in self._dataset_ids():
+                refs = self._read_refs(dataset_id)
+                refs["workers"] = {
+                    holder: count for holder, count in refs["workers"].items()
+                    if self._holder_alive(holder)
+                }
+                refs["sessions"] = {
+                    session_id: last_used for session_id, last_used in refs["sessions"].items()
+                    if now - last_used <= self.session_ttl
+                }
+                if self._write_or_delete(dataset_id, refs):
+                    removed += 1
+            for tmp_path in self.root.glob(".*.tmp"):
+                tmp_path.unlink(missing_ok=True)
+        return removed
+
+    def holders(self, dataset_id: str) -> Dict[str, Dict]:
+        """Return the worker and session holders of a dataset."""
+        with self._locked():
+            return self._read_refs(dataset_id)
+
+    @staticmethod
+    def _arrow_compatible(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Store object columns holding mixed types as strings.
+
+        `pd.read_csv` infers types chunk by chunk, so a large file can give a
+        column of both ints and strs, which Arrow refuses to convert.
+        """
+        mixed = [
+            col for col in df.columns
+            if df[col].dtype == object
+            and pd.api.types.infer_dtype(df[col], skipna=True) not in ARROW_OBJECT_TYPES
+        ]
+        if not mixed:
+            return df
+        df = df.copy()
+        for col in mixed:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return df
+
+    def _dataset_ids(self) -> Iterator[str]:
+        for refs_path in self.root.glob("*.refs"):
+            if DATASET_ID_PATTERN.fullmatch(refs_path.stem):
+                yield refs_path.stem
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self.root / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _path(self, dataset_id: str, suffix: str) -> Path:
+        """Build a store path, rejecting ids that are not plain hex digests."""
+        if not isinstance(dataset_id, str) or not DATASET_ID_PATTERN.fullmatch(dataset_id):
+            raise KeyError(f"Invalid dataset id: {dataset_id!r}")
+        path = (self.root / f"{dataset_id}{suffix}").resolve()
+        if path.parent != self.root:
+            raise KeyError(f"Invalid dataset id: {dataset_id!r}")
+        return path
+
+    def _data_path(self, dataset_id: str) -> Path:
+        return self._path(dataset_id, ".arrow")
+
+    def _refs_path(self, dataset_id: str) -> Path:
+        return self._path(dataset_id, ".refs")
+
+    def _read_refs(self, dataset_id: str) -> Dict:
+        try:
+            refs = json.loads(self._refs_path(dataset_id).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            refs = {}
+        return {"workers": refs.get("workers", {}), "sessions": refs.get("sessions", {})}
+
+    def _write_or_delete(self, dataset_id: str, refs: Dict) -> bool:
+        """Persist refs, or delete the dataset if no holder remains. Caller holds the lock."""
+        if refs["workers"] or refs["sessions"]:
+            self._refs_path(dataset_id).write_text(json.dumps(refs))
+            return False
+        self._data_path(dataset_id).unlink(missing_ok=True)
+        self._refs_path(dataset_id).unlink(missing_ok=True)
+        logger.info(f"Deleted shared dataset {dataset_id}")
+        return True
+
+    def _release_worker(self, dataset_id: str) -> None:
+        with self._locked():
+            refs = self._read_refs(dataset_id)
+            count = refs["workers"].get(self._holder, 0) - 1
+            if count > 0:
+                refs["workers"][self._holder] = count
+            else:
+                refs["workers"].pop(self._holder, None)
+            self._write_or_delete(dataset_id, refs)
+
+    @staticmethod
+    def _holder_alive(holder: str) -> bool:
+        if not holder.startswith("pid:"):
+            return True
+        try:
+            os.kill(int(holder[4:]), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
@@ -2,27 +2,45 @@ import gradio as gr
 import pandas as pd
 import plotly.express as px
 from pathlib import Path
+import argparse
 import logging
-from typing import List, Optional, Tuple, Dict, Any
+import os
+import sys
+from typing import TYPE_CHECKING, List, Optional, Tuple, Dict, Any
 from datetime import datetime
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def configure_logging():
+    """Log to app.log and the console; called when the app is started, not on import."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('app.log'),
+            logging.StreamHandler()
+        ]
+    )
+
 from data.csv_handler import CSVHandler
 from agent.llm_agent import LLMAgent, QueryRequest
+from visualization.plotter import Plotter
+
+if TYPE_CHECKING:
+    from data.shared_store import SharedDatasetStore
 
 class CSVQAApp:
-    def __init__(self):
-        self.csv_handler = CSVHandler()
-        self.llm_agent = LLMAgent()
+    def __init__(
+        self,
+        llm_agent: Optional[LLMAgent] = None,
+        dataset_store: Optional["SharedDatasetStore"] = None
+    ):
+        self.dataset_store = dataset_store
+        # Conversation history lives in one process's memory, so it is only
+        # kept when every request reaches the same process
+        self.conversations = dataset_store is None
+        self.csv_handler = CSVHandler(dataset_store)
+        self.llm_agent = llm_agent or LLMAgent()
         self.theme = gr.themes.Base()
         self.current_columns = []
 
@@ -33,6 +51,8 @@ class CSVQAApp:
             with gr.Row():
                 file_input = gr.File(label="Upload CSV File")
                 status = gr.Textbox(label="Status", interactive=False)
+                # Shared dataset id; kept client-side so any worker can serve the session
+                dataset_id = gr.Textbox(visible=False)
             
             with gr.Tabs():
                 with gr.TabItem("Ask Questions"):
@@ -40,7 +60,9 @@ class CSVQAApp:
                         label="Ask a question about your data",
                         placeholder="Example: What is the average price?"
                     )
-                    submit_btn = gr.Button("Get Answer")
+                    with gr.Row():
+                        submit_btn = gr.Button("Get Answer")
+                        reset_btn = gr.Button("New Conversation", visible=self.conversations)
                     answer = gr.Textbox(label="Answer", interactive=False)
                 
                 with gr.TabItem("Data Preview"):
@@ -53,12 +75,16 @@ class CSVQAApp:
                                 label="X-axis Column",
                                 choices=self.current_columns,  # Initialize empty
                                 interactive=True,
+                                # Choices are updated per process; other workers must accept them
+                                allow_custom_value=self.dataset_store is not None,
                                 value=None  # Explicitly set no default value
                             )
                             y_col = gr.Dropdown(
                                 label="Y-axis Column",
                                 choices=self.current_columns,  # Initialize empty
                                 interactive=True,
+                                # Choices are updated per process; other workers must accept them
+                                allow_custom_value=self.dataset_store is not None,
                                 value=None  # Explicitly set no default value
                             )
                             plot_type = gr.Dropdown(
@@ -71,159 +97,268 @@ class CSVQAApp:
                     with gr.Row():
                         plot_output = gr.Plot(label="Visualization")
 
-            def handle_file_upload(file):
-                try:
-                    if file is None:
-                        return None, "Please upload a file", [], []
-                    
-                    success = self.csv_handler.load_csv(file.name)
-                    if success:
-                        df = self.csv_handler.get_dataframe()
-                        self.current_columns = list(df.columns)  # Update stored columns
-                        
-                        # Return values for all outputs
-                        return (
-                            df.head(),  # Preview
-                            "File loaded successfully",  # Status
-                            gr.Dropdown(choices=self.current_columns),  # x_col update
-                            gr.Dropdown(choices=self.current_columns)   # y_col update
-                        )
-                    return None, "Failed to load file", [], []
-                except Exception as e:
-                    logger.error(f"File upload error: {str(e)}")
-                    return None, f"Error: {str(e)}", [], []
-
-            async def handle_question(question_text):
-                try:
-                    if not question_text.strip():
-                        return "Please enter a question"
-                    
-                    if self.csv_handler.df is None:
-                        return "Please upload a CSV file first"
-                    
-                    context = self.csv_handler.get_column_info()
-                    query = QueryRequest(question=question_text, context=context)
-                    
-                    response = await self.llm_agent.process_query(query)
-                    return response
-                except Exception as e:
-                    logger.error(f"Question handling error: {str(e)}")
-                    return f"Error: {str(e)}"
-
-            def create_plot(x_col, y_col, plot_type):
-                try:
-                    if self.csv_handler.df is None:
-                        return gr.Plot(visible=False)
-                    
-                    if not x_col:
-                        return gr.Plot(visible=False)
-                    
-                    df = self.csv_handler.df
-                    
-                    # Configure common layout settings
-                    layout_config = {
-                        "template": "plotly_white",
-                        "margin": dict(l=50, r=50, t=50, b=50),
-                        "hoverlabel": dict(bgcolor="white", font_size=12)
-                    }
-                    
-                    if plot_type == "histogram":
-                        # Single column distribution
-                        fig = px.histogram(
-                            df, 
-                            x=x_col,
-                            title=f"Distribution of {x_col}",
-                            opacity=0.7,
-                            nbins=30  # Adjust number of bins
-                        )
-                        fig.update_layout(
-                            **layout_config,
-                            yaxis_title="Frequency",
-                            bargap=0.1
-                        )
-                        
-                    elif plot_type == "scatter":
-                        # Relationship between two numeric columns
-                        if not y_col:
-                            return gr.Plot(visible=False)
-                        fig = px.scatter(
-                            df,
-                            x=x_col,
-                            y=y_col,
-                            title=f"Relationship: {y_col} vs {x_col}",
-                            opacity=0.6,
-                            trendline="ols"  # Add trend line
-                        )
-                        fig.update_layout(**layout_config)
-                        
-                    elif plot_type == "bar":
-                        # Aggregated bar chart
-                        if not y_col:
-                            return gr.Plot(visible=False)
-                        agg_df = df.groupby(x_col)[y_col].mean().reset_index()
-                        fig = px.bar(
-                            agg_df,
-                            x=x_col,
-                            y=y_col,
-                            title=f"Average {y_col} by {x_col}",
-                            color=y_col  # Color bars by value
-                        )
-                        fig.update_layout(
-                            **layout_config,
-                            showlegend=False
-                        )
-                        
-                    elif plot_type == "line":
-                        # Time series or ordered data
-                        if not y_col:
-                            return gr.Plot(visible=False)
-                        fig = px.line(
-                            df.sort_values(x_col),  # Sort by x-axis
-                            x=x_col,
-                            y=y_col,
-                            title=f"Trend: {y_col} over {x_col}",
-                            markers=True  # Show points
-                        )
-                        fig.update_layout(**layout_config)
-                    
-                    # Common updates for all plots
-                    fig.update_xaxes(title_text=x_col)
-                    fig.update_yaxes(title_text=y_col if plot_type != "histogram" else "Frequency")
-                    
-                    return fig
-                except Exception as e:
-                    logger.error(f"Plot creation error: {str(e)}")
-                    return gr.Plot(visible=False)
+            # Queued events keep per-process state, so multi-worker mode
+            # sends each event as a single request instead
+            queue = self.dataset_store is None
 
             file_input.change(
-                fn=handle_file_upload,
-                inputs=[file_input],
-                outputs=[data_preview, status, x_col, y_col]
+                fn=self.handle_file_upload,
+                inputs=[file_input, dataset_id],
+                outputs=[data_preview, status, x_col, y_col, dataset_id],
+                queue=queue
             )
             
             submit_btn.click(
-                handle_question,
-                inputs=[question],
-                outputs=[answer]
+                self.handle_question,
+                inputs=[question, dataset_id],
+                outputs=[answer],
+                queue=queue
+            )
+            
+            reset_btn.click(
+                self.reset_conversation,
+                inputs=None,
+                outputs=[answer],
+                queue=queue
             )
             
             plot_btn.click(
-                create_plot,
-                inputs=[x_col, y_col, plot_type],
-                outputs=[plot_output]
+                self.create_plot,
+                inputs=[x_col, y_col, plot_type, dataset_id],
+                outputs=[plot_output],
+                queue=queue
             )
 
         return interface
 
+    @staticmethod
+    def _session_id(request: Optional[gr.Request]) -> str:
+        """
+        Gradio's session hash, used to scope shared datasets to a session.
+
+        The browser generates it and sends it with each request, so it is an
+        unguessable bearer value rather than an id the server issued.
+        """
+        return request.session_hash if request is not None else "local"
+
+    def _get_handler(
+        self,
+        dataset_id: Optional[str] = None,
+        request: Optional[gr.Request] = None
+    ) -> CSVHandler:
+        """Return the handler holding the session's dataset."""
+        if self.dataset_store is None or not dataset_id:
+            return self.csv_handler
+
+        # The store only opens datasets this session uploaded
+        handler = CSVHandler(self.dataset_store)
+        handler.load_shared(dataset_id, self._session_id(request))
+        return handler
+
+    def handle_file_upload(
+        self,
+        file,
+        dataset_id: Optional[str] = None,
+        request: Optional[gr.Request] = None
+    ):
+        try:
+            if file is None:
+                return None, "Please upload a file", [], [], dataset_id
+            
+            # Sessions must not share a handler once datasets live in the shared store
+            handler = CSVHandler(self.dataset_store) if self.dataset_store else self.csv_handler
+            session_id = self._session_id(request)
+            success = handler.load_csv(file.name, session_id=session_id)
+            if success:
+                df = handler.get_dataframe()
+                self.current_columns = list(df.columns)  # Update stored columns
+
+                if self.dataset_store:
+                    # Release by session hash rather than a dataset id sent in component values
+                    self.dataset_store.release_session(session_id, keep=handler.dataset_id)
+                    self.dataset_store.sweep()
+                
+                # Return values for all outputs
+                return (
+                    df.head(),  # Preview
+                    "File loaded successfully",  # Status
+                    gr.Dropdown(choices=self.current_columns),  # x_col update
+                    gr.Dropdown(choices=self.current_columns),  # y_col update
+                    handler.dataset_id  # Shared dataset id
+                )
+            return None, "Failed to load file", [], [], dataset_id
+        except Exception as e:
+            logger.error(f"File upload error: {str(e)}")
+            return None, f"Error: {str(e)}", [], [], dataset_id
+
+    async def handle_question(
+        self,
+        question_text,
+        dataset_id: Optional[str] = None,
+        request: Optional[gr.Request] = None
+    ):
+        try:
+            if not question_text.strip():
+                return "Please enter a question"
+            
+            handler = self._get_handler(dataset_id, request)
+            if handler.df is None:
+                return "Please upload a CSV file first"
+            
+            context = handler.get_column_info()
+            query = QueryRequest(
+                question=question_text,
+                context=context,
+                session_id=request.session_hash if request and self.conversations else None
+            )
+            
+            response = await self.llm_agent.process_query(query)
+            return response
+        except Exception as e:
+            logger.error(f"Question handling error: {str(e)}")
+            return f"Error: {str(e)}"
+
+    def reset_conversation(self, request: Optional[gr.Request] = None):
+        if request is not None and self.conversations:
+            self.llm_agent.reset_session(request.session_hash)
+        return ""
+
+    def create_plot(
+        self,
+        x_col,
+        y_col,
+        plot_type,
+        dataset_id: Optional[str] = None,
+        request: Optional[gr.Request] = None
+    ):
+        try:
+            df = self._get_handler(dataset_id, request).df
+            if df is None:
+                return gr.Plot(visible=False)
+            
+            if not x_col:
+                return gr.Plot(visible=False)
+            
+            df = Plotter.parse_dates(df, [x_col, y_col])
+            
+            # Configure common layout settings
+            layout_config = {
+                "template": "plotly_white",
+                "margin": dict(l=50, r=50, t=50, b=50),
+                "hoverlabel": dict(bgcolor="white", font_size=12)
+            }
+            
+            if plot_type == "histogram":
+                # Single column distribution
+                fig = px.histogram(
+                    df, 
+                    x=x_col,
+                    title=f"Distribution of {x_col}",
+                    opacity=0.7,
+                    nbins=30  # Adjust number of bins
+                )
+                fig.update_layout(
+                    **layout_config,
+                    yaxis_title="Frequency",
+                    bargap=0.1
+                )
+                
+            elif plot_type == "scatter":
+                # Relationship between two numeric columns
+                if not y_col:
+                    return gr.Plot(visible=False)
+                fig = px.scatter(
+                    df,
+                    x=x_col,
+                    y=y_col,
+                    title=f"Relationship: {y_col} vs {x_col}",
+                    opacity=0.6,
+                    trendline="ols",  # Add trend line
+                    render_mode=Plotter.render_mode(df)  # WebGL for large data
+                )
+                Plotter.thin_trendlines(fig)
+                fig.update_layout(**layout_config)
+                
+            elif plot_type == "bar":
+                # Aggregated bar chart
+                if not y_col:
+                    return gr.Plot(visible=False)
+                agg_df = df.groupby(x_col)[y_col].mean().reset_index()
+                fig = px.bar(
+                    agg_df,
+                    x=x_col,
+                    y=y_col,
+                    title=f"Average {y_col} by {x_col}",
+                    color=y_col  # Color bars by value
+                )
+                fig.update_layout(
+                    **layout_config,
+                    showlegend=False
+                )
+                
+            elif plot_type == "line":
+                # Time series or ordered data
+                if not y_col:
+                    return gr.Plot(visible=False)
+                fig = px.line(
+                    df.sort_values(x_col),  # Sort by x-axis
+                    x=x_col,
+                    y=y_col,
+                    title=f"Trend: {y_col} over {x_col}",
+                    markers=True,  # Show points
+                    render_mode=Plotter.render_mode(df)  # WebGL for large data
+                )
+                fig.update_layout(**layout_config)
+            
+            # Common updates for all plots
+            fig.update_xaxes(title_text=x_col)
+            fig.update_yaxes(title_text=y_col if plot_type != "histogram" else "Frequency")
+            
+            return Plotter.encode_arrays(fig)
+        except Exception as e:
+            logger.error(f"Plot creation error: {str(e)}")
+            return gr.Plot(visible=False)
+
+def create_server_app():
+    """Build one worker's ASGI app for multi-worker serving (used by uvicorn)."""
+    from fastapi import FastAPI
+    from data.shared_store import SharedDatasetStore
+
+    configure_logging()
+    dataset_store = SharedDatasetStore(os.environ.get("CSV_QA_SHARED_DIR", "/dev/shm/csv-qa"))
+    dataset_store.sweep()
+    app = CSVQAApp(dataset_store=dataset_store)
+    logger.warning("Multi-worker mode: follow-up questions do not keep conversation history")
+    return gr.mount_gradio_app(FastAPI(), app.create_interface(), path="/")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV Question Answering System")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7860)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes sharing one port")
+    parser.add_argument("--shared-dir", default="/dev/shm/csv-qa", help="Shared-memory dataset directory")
+    args = parser.parse_args()
+    configure_logging()
+
     try:
-        app = CSVQAApp()
-        interface = app.create_interface()
-        interface.launch(
-            server_name="127.0.0.1",
-            server_port=7860,
-            share=False
-        )
+        if args.workers > 1:
+            # Exec the uvicorn CLI so workers import the app once, not via this __main__ too
+            os.environ["CSV_QA_SHARED_DIR"] = args.shared_dir
+            os.execvp(sys.executable, [
+                sys.executable, "-m", "uvicorn", "main:create_server_app", "--factory",
+                "--app-dir", os.path.dirname(os.path.abspath(__file__)),
+                "--host", args.host,
+                "--port", str(args.port),
+                "--workers", str(args.workers)
+            ])
+        else:
+            app = CSVQAApp()
+            interface = app.create_interface()
+            interface.launch(
+                server_name=args.host,
+                server_port=args.port,
+                share=False
+            )
     except Exception as e:
         logger.error(f"Application failed to start: {str(e)}")
         raise
\ No newline at end of file
@@ -1,15 +1,84 @@
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Optional, Literal, Dict, Any
+from typing import Optional, Literal, Dict, Any, List
 import pandas as pd
 import logging
 import numpy as np
+import re
 
 logger = logging.getLogger(__name__)
 
+ISO_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
 class Plotter:
     PLOT_TYPES = Literal['scatter', 'line', 'bar', 'box', 'histogram']
+    # Above this many rows scatter/line plots use WebGL (scattergl) traces
+    WEBGL_THRESHOLD = 10_000
     
+    @staticmethod
+    def render_mode(df: pd.DataFrame) -> str:
+        """Pick SVG for small data and WebGL once SVG gets slow to render."""
+        return 'webgl' if len(df) > Plotter.WEBGL_THRESHOLD else 'svg'
+
+    @staticmethod
+    def thin_trendlines(fig: go.Figure) -> go.Figure:
+        """
+        Reduce OLS trendline traces of WebGL plots to their two end points.
+
+        Plotly Express emits one trendline point per data point, doubling the
+        payload of large scatter plots; a straight line only needs its ends.
+        Only figures that `render_mode` switched to WebGL are large enough to
+        bother, so SVG figures are left as they are.
+        """
+        for trace in fig.data:
+            if trace.type != 'scattergl' or trace.mode != 'lines' or trace.x is None or len(trace.x) <= 2:
+                continue
+            trace.update(x=[trace.x[0], trace.x[-1]], y=[trace.y[0], trace.y[-1]])
+        return fig
+
+    @staticmethod
+    def parse_dates(df: pd.DataFrame, columns: List[Optional[str]]) -> pd.DataFrame:
+        """
+        Convert ISO-formatted date strings in `columns` to datetimes.
+
+        `pd.read_csv` leaves dates as strings, which plotly would send as JSON
+        string lists; as datetimes, `encode_arrays` can ship them as typed arrays.
+        """
+        parsed = {}
+        for col in dict.fromkeys(columns):
+            if col not in df.columns or not pd.api.types.is_string_dtype(df[col]):
+                continue
+            values = df[col].dropna()
+            if values.empty or not ISO_DATE_PATTERN.match(str(values.iloc[0])):
+                continue
+            try:
+                parsed[col] = pd.to_datetime(df[col], format='ISO8601')
+            except (ValueError, TypeError):
+                continue
+        return df.assign(**parsed) if parsed else df
+
+    @staticmethod
+    def encode_arrays(fig: go.Figure) -> go.Figure:
+        """
+        Make trace data serialize as base64 typed arrays instead of JSON lists.
+
+        Plotly already encodes numeric numpy arrays this way; datetime arrays
+        are sent as ISO strings, so they are converted to epoch milliseconds
+        on a date axis. Date columns read from CSV are strings until
+        `parse_dates` converts them.
+        """
+        for trace in fig.data:
+            for axis in ('x', 'y'):
+                values = getattr(trace, axis, None)
+                if not isinstance(values, np.ndarray) or values.dtype.kind != 'M':
+                    continue
+                millis = values.astype('datetime64[ms]').astype('int64').astype('float64')
+                millis[np.isnat(values)] = np.nan
+                trace.update({axis: millis})
+                layout_axis = trace[f'{axis}axis'] or axis
+                fig.layout[layout_axis.replace(axis, f'{axis}axis', 1)].type = 'date'
+        return fig
+
     @staticmethod
     def create_plot(
         df: pd.DataFrame, 
@@ -39,6 +108,8 @@ class Plotter:
             if x_col not in df.columns:
                 raise ValueError(f"Column {x_col} not found in DataFrame")
                 
+            df = Plotter.parse_dates(df, [x_col, y_col])
+
             # Handle missing values
             df_clean = df.dropna(subset=[x_col])
             if len(df_clean) < len(df):
@@ -67,15 +138,18 @@ class Plotter:
                         title=f'{y_col} vs {x_col}',
                         trendline="ols",
                         trendline_color_override="red",
-                        opacity=0.6
+                        opacity=0.6,
+                        render_mode=Plotter.render_mode(df_clean)
                     )
+                    Plotter.thin_trendlines(fig)
                 elif plot_type == 'line':
                     fig = px.line(
                         df_clean, 
                         x=x_col, 
                         y=y_col,
                         title=f'{y_col} over {x_col}',
-                        markers=True
+                        markers=True,
+                        render_mode=Plotter.render_mode(df_clean)
                     )
                 elif plot_type == 'bar':
                     fig = px.bar(
@@ -124,7 +198,7 @@ class Plotter:
             ])
             fig.update_traces(hovertemplate=hover_template)
             
-            return fig
+            return Plotter.encode_arrays(fig)
             
         except Exception as e:
             logger.error(f"Error creating plot: {str(e)}")
@@ -0,0 +1,8 @@
+import pytest
+from src.benchmark.fake_ollama import FakeOllamaServer
+
+@pytest.fixture
+def fake_server():
+    """Start a fast local stand-in for the Ollama API."""
+    with FakeOllamaServer(latency=0, tokens_per_second=10_000, response_tokens=5) as server:
+        yield server
@@ -50,4 +50,56 @@ async def test_invalid_context():
     )
     response = await agent.process_query(query)
     
-    assert "No data available" in response
\ No newline at end of file
+    assert "No data available" in response
+
+
+@pytest.mark.asyncio
+async def test_follow_up_keeps_stable_prefix(sample_query, fake_server):
+    """Test that follow-up turns reuse the system prompt and carry history."""
+    agent = LLMAgent(host=fake_server.url, rate_limit_seconds=0)
+    sample_query.session_id = "session-1"
+
+    await agent.process_query(sample_query)
+    first_messages = fake_server.last_request["messages"]
+    await agent.process_query(sample_query.model_copy(update={"question": "And the maximum?"}))
+    second_messages = fake_server.last_request["messages"]
+
+    assert len(first_messages) == 2
+    assert len(second_messages) == 4
+    assert second_messages[:2] == first_messages
+    assert second_messages[-1]["content"] == "Question: And the maximum?"
+    assert fake_server.last_request["keep_alive"] == agent.keep_alive
+    assert fake_server.cached_prompt_chars >= len(first_messages[0]["content"])
+
+@pytest.mark.asyncio
+async def test_session_resets_on_new_context(sample_query, fake_server):
+    """Test that a different dataset starts a fresh conversation."""
+    agent = LLMAgent(host=fake_server.url, rate_limit_seconds=0)
+    sample_query.session_id = "session-1"
+    await agent.process_query(sample_query)
+
+    sample_query.context = {**sample_query.context, "row_count": 200}
+    await agent.process_query(sample_query)
+
+    assert len(agent.sessions["session-1"].history) == 2
+
+@pytest.mark.asyncio
+async def test_history_trimmed_to_budget(sample_query, fake_server):
+    """Test that history is cut back once it exceeds the token budget."""
+    agent = LLMAgent(host=fake_server.url, rate_limit_seconds=0, history_token_budget=20)
+    sample_query.session_id = "session-1"
+    for _ in range(5):
+        await agent.process_query(sample_query)
+
+    assert agent._estimate_tokens(agent.sessions["session-1"].history) <= 20
+
+@pytest.mark.asyncio
+async def test_empty_stream_returns_error(sample_query):
+    """Test that a response stream without chunks is reported and not added to history."""
+    agent = LLMAgent(rate_limit_seconds=0)
+    agent.client.chat = lambda **kwargs: iter([])
+    sample_query.session_id = "session-1"
+    response = await agent.process_query(sample_query)
+
+    assert response.startswith("Error:")
+    assert agent.sessions["session-1"].history == []
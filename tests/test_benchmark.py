@@ -0,0 +1,36 @@
+import pytest
+import ollama
+import pandas as pd
+from src.benchmark.data_generator import generate_csv, generate_dataframe
+
+def test_generate_dataframe_shape():
+    df = generate_dataframe(rows=100, columns=7, dtypes=('float', 'int', 'category', 'datetime', 'bool'))
+    assert df.shape == (100, 7)
+    assert list(df.columns)[:3] == ['float_0', 'int_1', 'category_2']
+
+def test_generate_dataframe_is_reproducible():
+    first = generate_dataframe(rows=50, seed=42)
+    second = generate_dataframe(rows=50, seed=42)
+    pd.testing.assert_frame_equal(first, second)
+
+def test_generate_dataframe_invalid_dtype():
+    with pytest.raises(ValueError):
+        generate_dataframe(dtypes=('complex',))
+
+def test_generate_csv(tmp_path):
+    path = generate_csv(tmp_path / "synthetic.csv", rows=20, columns=3)
+    df = pd.read_csv(path)
+    assert len(df) == 20
+    assert len(df.columns) == 3
+
+def test_fake_server_chat(fake_server):
+    client = ollama.Client(host=fake_server.url)
+    response = client.chat(model="fake", messages=[{"role": "user", "content": "hi"}])
+    assert response['message']['content'] == "token " * 5
+    assert fake_server.request_count == 1
+
+def test_fake_server_streaming_chat(fake_server):
+    client = ollama.Client(host=fake_server.url)
+    chunks = list(client.chat(model="fake", messages=[{"role": "user", "content": "hi"}], stream=True))
+    assert chunks[-1]['done'] is True
+    assert "".join(chunk['message']['content'] for chunk in chunks) == "token " * 5
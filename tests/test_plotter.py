@@ -67,5 +67,58 @@ class TestPlotter(unittest.TestCase):
                 plot_type='scatter'
             )
 
+    def test_small_scatter_uses_svg(self):
+        plot = Plotter.create_plot(
+            df=self.sample_df,
+            x_col='x_values',
+            y_col='y_values',
+            plot_type='scatter'
+        )
+        self.assertEqual(plot.data[0].type, 'scatter')
+
+    def test_large_scatter_uses_webgl(self):
+        n = Plotter.WEBGL_THRESHOLD + 1
+        large_df = pd.DataFrame({'x_values': np.arange(n), 'y_values': np.arange(n) * 2.0})
+        plot = Plotter.create_plot(
+            df=large_df,
+            x_col='x_values',
+            y_col='y_values',
+            plot_type='scatter'
+        )
+        self.assertEqual(plot.data[0].type, 'scattergl')
+        # Trendline reduced to its end points
+        self.assertEqual(len(plot.data[1].x), 2)
+        self.assertIn('"bdata"', plot.to_json())
+
+    def test_datetime_axis_encoded_as_typed_array(self):
+        dates_df = pd.DataFrame({
+            'date': pd.date_range('2024-01-01', periods=5, freq='D'),
+            'y_values': [5, 4, 3, 2, 1]
+        })
+        plot = Plotter.create_plot(
+            df=dates_df,
+            x_col='date',
+            y_col='y_values',
+            plot_type='line'
+        )
+        self.assertEqual(plot.layout.xaxis.type, 'date')
+        self.assertEqual(plot.data[0].x.dtype.kind, 'f')
+        self.assertEqual(plot.data[0].x[0], pd.Timestamp('2024-01-01').value / 1e6)
+    def test_iso_date_strings_parsed(self):
+        # Dates loaded by pd.read_csv arrive as strings
+        dates_df = pd.DataFrame({
+            'date': ['2024-01-01', '2024-01-02', None, '2024-01-04'],
+            'label': ['2024', 'b', 'c', 'd'],
+            'y_values': [5, 4, 3, 2]
+        })
+        parsed = Plotter.parse_dates(dates_df, ['date', 'label', 'y_values'])
+        self.assertEqual(parsed['date'].dtype.kind, 'M')
+        self.assertTrue(pd.api.types.is_string_dtype(parsed['label']))
+        self.assertTrue(pd.api.types.is_string_dtype(dates_df['date']))
+
+        plot = Plotter.create_plot(df=dates_df, x_col='date', y_col='y_values', plot_type='line')
+        self.assertEqual(plot.layout.xaxis.type, 'date')
+        self.assertIn('"bdata"', plot.to_json())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+import pytest
+import pandas as pd
+from src.data.shared_store import SharedDatasetStore
+from src.data.csv_handler import CSVHandler
+
+@pytest.fixture
+def store(tmp_path):
+    store = SharedDatasetStore(tmp_path / "shm")
+    yield store
+    store.close_all()
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'price': [10000.0, 20000.0, 30000.0],
+        'year': [2020, 2021, 2022],
+        'model': ['A', 'B', 'C']
+    })
+
+def test_publish_and_open(store, sample_df):
+    dataset_id = store.publish(sample_df, session_id="s1")
+    df = store.open(dataset_id, "s1")
+    pd.testing.assert_frame_equal(df, sample_df, check_dtype=False)
+    holders = store.holders(dataset_id)
+    assert list(holders["sessions"]) == ["s1"]
+    assert holders["workers"] == {f"pid:{os.getpid()}": 1}
+
+def test_publish_mixed_type_column(store, tmp_path):
+    csv_path = tmp_path / "mixed.csv"
+    # Large enough that read_csv infers types per chunk and mixes int and str
+    pd.DataFrame({'a': list(range(300_000)) + ['x'], 'b': 1}).to_csv(csv_path, index=False)
+    with pytest.warns(pd.errors.DtypeWarning):
+        df = pd.read_csv(csv_path)
+    assert pd.api.types.infer_dtype(df['a']) == 'mixed-integer'
+
+    dataset_id = store.publish(df, session_id="s1")
+    opened = store.open(dataset_id, "s1")
+    assert opened['a'].iloc[0] == '0'
+    assert opened['a'].iloc[-1] == 'x'
+
+def test_open_is_memory_mapped(store, sample_df):
+    dataset_id = store.publish(sample_df, session_id="s1")
+    df = store.open(dataset_id, "s1")
+    # Numeric columns are read-only views over the mapped Arrow buffers
+    assert not df['price'].to_numpy().flags.writeable
+    assert store.open(dataset_id, "s1") is df
+
+def test_open_unknown_dataset(store):
+    with pytest.raises(KeyError):
+        store.open("0" * 64, "s1")
+
+def test_open_requires_session_ref(store, sample_df):
+    dataset_id = store.publish(sample_df, session_id="s1")
+    with pytest.raises(KeyError):
+        store.open(dataset_id, "other-session")
+
+@pytest.mark.parametrize("dataset_id", ["../victim", "A" * 64, "0" * 63, "0" * 64 + "\n"])
+def test_invalid_ids_rejected(store, sample_df, dataset_id):
+    with pytest.raises(KeyError):
+        store.open(dataset_id, "s1")
+    with pytest.raises(KeyError):
+        store.publish(sample_df, session_id="s1", dataset_id=dataset_id)
+
+def test_release_only_affects_own_session(store, sample_df):
+    dataset_id = store.publish(sample_df, session_id="s1")
+    store.release_session("attacker")
+    store.release_session("attacker")
+    assert list(store.holders(dataset_id)["sessions"]) == ["s1"]
+
+    store.release_session("s1")
+    assert not (store.root / f"{dataset_id}.arrow").exists()
+
+def test_release_keeps_current_dataset(store, sample_df):
+    first = store.publish(sample_df, session_id="s1")
+    second = store.publish(sample_df.head(1), session_id="s1")
+    store.release_session("s1", keep=second)
+    assert not (store.root / f"{first}.arrow").exists()
+    assert (store.root / f"{second}.arrow").exists()
+
+def test_republish_does_not_add_refs(store, sample_df):
+    dataset_id = "a" * 64
+    for _ in range(3):
+        store.publish(sample_df, session_id="s1", dataset_id=dataset_id)
+    assert store.holders(dataset_id)["sessions"].keys() == {"s1"}
+    store.release_session("s1")
+    assert not (store.root / f"{dataset_id}.arrow").exists()
+
+def test_concurrent_opens_take_one_worker_ref(store, sample_df):
+    dataset_id = store.publish(sample_df, session_id="s1")
+    threads = [threading.Thread(target=store.open, args=(dataset_id, "s1")) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.holders(dataset_id)["workers"] == {f"pid:{os.getpid()}": 1}
+
+    store.release_session("s1")
+    store.close(dataset_id)
+    assert not (store.root / f"{dataset_id}.arrow").exists()
+
+def test_open_refreshes_last_used(store, sample_df):
+    dataset_id = store.publish(sample_df, session_id="s1")
+    published_at = store.holders(dataset_id)["sessions"]["s1"]
+    store.open(dataset_id, "s1")
+    time.sleep(0.01)
+    store.open(dataset_id, "s1")
+    assert store.holders(dataset_id)["sessions"]["s1"] > published_at
+
+def test_sweep_drops_dead_processes_and_idle_sessions(tmp_path, sample_df):
+    store = SharedDatasetStore(tmp_path / "shm", session_ttl_seconds=0)
+    dataset_id = store.publish(sample_df, session_id="s1")
+    refs_path = store.root / f"{dataset_id}.refs"
+    refs_path.write_text('{"workers": {"pid:999999999": 1}, "sessions": {"s1": 0}}')
+    assert store.sweep() == 1
+    assert not (store.root / f"{dataset_id}.arrow").exists()
+
+def test_csv_handler_shares_dataset(store, tmp_path, sample_df):
+    csv_path = tmp_path / "test.csv"
+    sample_df.to_csv(csv_path, index=False)
+
+    publisher = CSVHandler(store)
+    assert publisher.load_csv(str(csv_path), session_id="s1") is True
+    assert publisher.dataset_id is not None
+
+    reader = CSVHandler(store)
+    assert reader.load_shared(publisher.dataset_id, "s1") is True
+    assert reader.get_column_info()['row_count'] == 3
+
+    assert CSVHandler(store).load_shared(publisher.dataset_id, "other-session") is False
@@ -0,0 +1,46 @@
+import pytest
+from src.benchmark.stats import StageRecorder, format_report
+
+@pytest.fixture
+def recorder():
+    recorder = StageRecorder()
+    for seconds in [0.01 * i for i in range(1, 101)]:
+        recorder.record('question', seconds)
+    recorder.record('upload', 0.5, ok=False)
+    recorder.record('plot_serialize', 0.02)
+    recorder.record_bytes('plot_serialize', 2048)
+    return recorder
+
+def test_summary_percentiles(recorder):
+    stats = recorder.summary(wall_time=10.0)['question']
+    assert stats['count'] == 100
+    assert stats['errors'] == 0
+    assert stats['p50_ms'] == pytest.approx(505.0)
+    assert stats['p95_ms'] == pytest.approx(950.5)
+    assert stats['p99_ms'] == pytest.approx(990.1)
+    assert stats['throughput_per_s'] == pytest.approx(10.0)
+
+def test_summary_errors_and_payload(recorder):
+    summary = recorder.summary(wall_time=10.0)
+    assert summary['upload']['errors'] == 1
+    assert summary['plot_serialize']['p50_bytes'] == 2048
+    assert 'p50_bytes' not in summary['question']
+    assert 'followup' not in summary
+
+def test_summary_zero_wall_time(recorder):
+    assert recorder.summary(wall_time=0)['question']['throughput_per_s'] == 0.0
+
+def test_format_report_baseline_delta(recorder):
+    results = {'wall_time_s': 10.0, 'stages': recorder.summary(wall_time=10.0)}
+    baseline = {'stages': {'question': {'p50_ms': 1010.0, 'p95_ms': 950.5}}}
+    report = format_report(results, baseline)
+    question_line = next(line for line in report.splitlines() if line.startswith('question'))
+    assert '-50.0%' in question_line
+    assert '+0.0%' in question_line
+    assert 'Δp50' in report.splitlines()[0]
+    assert 'plot_serialize payload: p50 2.0 KiB' in report
+
+def test_format_report_without_baseline(recorder):
+    report = format_report({'wall_time_s': 10.0, 'stages': recorder.summary(wall_time=10.0)})
+    assert 'Δp50' not in report
+    assert report.endswith('wall time: 10.00s')